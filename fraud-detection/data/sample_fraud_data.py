@@ -5,9 +5,135 @@ Includes the leg amputation fraud case and other realistic fraud scenarios
 """
 
 import json
-import uuid
+import os
 from datetime import datetime, timedelta
-import random
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Shared generator for batched draws; one C-level call replaces a Python
+# random call per procedure field
+_rng = np.random.default_rng()
+
+def _batch_ids(n):
+    """
+    Allocate n random v4-style ids from a single urandom read instead of
+    one uuid4 object construction and str() format per id
+    """
+    raw = bytearray(os.urandom(16 * n))
+    ids = []
+    for i in range(n):
+        o = i * 16
+        raw[o + 6] = (raw[o + 6] & 0x0F) | 0x40
+        raw[o + 8] = (raw[o + 8] & 0x3F) | 0x80
+        h = raw[o:o + 16].hex()
+        ids.append(f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}")
+    return ids
+
+# Static skeleton of the leg amputation fraud case; only the ids and the
+# created_at timestamp vary per call, so the constant parts are built once
+# at import instead of on every call
+_LEG_AMP_PROCEDURES = (
+    {
+        "hospital": "Hospital A",
+        "hospital_id": "HOSP_A_001",
+        "procedure_code": "AMP001",
+        "procedure": "Left leg amputation",
+        "date": "2025-01-03",
+        "amount": 12000,
+        "insurance_provider": "NHIF",
+        "patient_name": "John Doe"
+    },
+    {
+        "hospital": "Hospital B",
+        "hospital_id": "HOSP_B_002",
+        "procedure_code": "AMP002",
+        "procedure": "Right leg amputation",
+        "date": "2025-01-17",
+        "amount": 13500,
+        "insurance_provider": "AAR Insurance",
+        "patient_name": "Jonathan Doe"
+    },
+    {
+        "hospital": "Hospital C",
+        "hospital_id": "HOSP_C_003",
+        "procedure_code": "AMP001",
+        "procedure": "Left leg amputation",
+        "date": "2025-02-10",
+        "amount": 12500,
+        "insurance_provider": "CIC Insurance",
+        "patient_name": "J. Doe"
+    },
+    {
+        "hospital": "Hospital D",
+        "hospital_id": "HOSP_D_004",
+        "procedure_code": "AMP002",
+        "procedure": "Right leg amputation",
+        "date": "2025-02-28",
+        "amount": 13200,
+        "insurance_provider": "Jubilee Insurance",
+        "patient_name": "John D."
+    }
+)
+
+_LEG_AMP_ANOMALIES = (
+    {
+        "type": "anatomical_violation",
+        "description": "Human anatomy constraint violation: More than 2 leg amputations claimed",
+        "severity": "CRITICAL",
+        "rule": "max_leg_amputations <= 2"
+    },
+    {
+        "type": "cross_provider_pattern",
+        "description": "Cross-provider pattern: Claims submitted to different hospitals",
+        "severity": "HIGH",
+        "rule": "multiple_hospitals_same_patient"
+    },
+    {
+        "type": "identity_reuse",
+        "description": "Identity reuse: Same patient ID with different name variations",
+        "severity": "HIGH",
+        "rule": "name_variations_same_id"
+    },
+    {
+        "type": "insurance_fraud",
+        "description": "Insurance fraud: Claims submitted to different insurance providers",
+        "severity": "HIGH",
+        "rule": "multiple_insurance_providers"
+    }
+)
+
+_LEG_DETECTION_RULES = {
+    "anatomical_constraints": {
+        "max_leg_amputations": 2,
+        "max_arm_amputations": 2,
+        "max_heart_surgeries": 1,
+        "max_brain_surgeries": 1
+    },
+    "temporal_patterns": {
+        "max_major_surgeries_per_month": 1,
+        "min_days_between_major_surgeries": 30
+    },
+    "geographic_patterns": {
+        "max_hospitals_per_patient": 2,
+        "max_distance_between_hospitals": 100
+    }
+}
+
+# Constant aggregates of the skeleton above
+_LEG_AMP_TOTAL = sum(p["amount"] for p in _LEG_AMP_PROCEDURES)
+_LEG_AMP_HOSPITAL_COUNT = len({p["hospital"] for p in _LEG_AMP_PROCEDURES})
+_LEG_AMP_INSURER_COUNT = len({p["insurance_provider"] for p in _LEG_AMP_PROCEDURES})
 
 class FraudDataGenerator:
     def __init__(self):
@@ -44,115 +170,30 @@ class FraudDataGenerator:
             ]
         }
 
-    def generate_leg_amputation_fraud_case(self):
+    def generate_leg_amputation_fraud_case(self, now_iso=None):
         """Generate the specific leg amputation fraud case from the requirements"""
+        if now_iso is None:
+            now_iso = datetime.now().isoformat()
         patient_id = "#123456"
-        base_date = datetime(2025, 1, 3)
-        
-        procedures = [
-            {
-                "id": str(uuid.uuid4()),
-                "hospital": "Hospital A",
-                "hospital_id": "HOSP_A_001",
-                "procedure_code": "AMP001",
-                "procedure": "Left leg amputation",
-                "date": "2025-01-03",
-                "amount": 12000,
-                "insurance_provider": "NHIF",
-                "patient_name": "John Doe"
-            },
-            {
-                "id": str(uuid.uuid4()),
-                "hospital": "Hospital B", 
-                "hospital_id": "HOSP_B_002",
-                "procedure_code": "AMP002",
-                "procedure": "Right leg amputation",
-                "date": "2025-01-17",
-                "amount": 13500,
-                "insurance_provider": "AAR Insurance",
-                "patient_name": "Jonathan Doe"
-            },
-            {
-                "id": str(uuid.uuid4()),
-                "hospital": "Hospital C",
-                "hospital_id": "HOSP_C_003", 
-                "procedure_code": "AMP001",
-                "procedure": "Left leg amputation",
-                "date": "2025-02-10",
-                "amount": 12500,
-                "insurance_provider": "CIC Insurance",
-                "patient_name": "J. Doe"
-            },
-            {
-                "id": str(uuid.uuid4()),
-                "hospital": "Hospital D",
-                "hospital_id": "HOSP_D_004",
-                "procedure_code": "AMP002", 
-                "procedure": "Right leg amputation",
-                "date": "2025-02-28",
-                "amount": 13200,
-                "insurance_provider": "Jubilee Insurance",
-                "patient_name": "John D."
-            }
-        ]
-        
-        anomalies = [
-            {
-                "type": "anatomical_violation",
-                "description": "Human anatomy constraint violation: More than 2 leg amputations claimed",
-                "severity": "CRITICAL",
-                "rule": "max_leg_amputations <= 2"
-            },
-            {
-                "type": "cross_provider_pattern", 
-                "description": "Cross-provider pattern: Claims submitted to different hospitals",
-                "severity": "HIGH",
-                "rule": "multiple_hospitals_same_patient"
-            },
-            {
-                "type": "identity_reuse",
-                "description": "Identity reuse: Same patient ID with different name variations", 
-                "severity": "HIGH",
-                "rule": "name_variations_same_id"
-            },
-            {
-                "type": "insurance_fraud",
-                "description": "Insurance fraud: Claims submitted to different insurance providers",
-                "severity": "HIGH", 
-                "rule": "multiple_insurance_providers"
-            }
-        ]
-        
-        detection_rules = {
-            "anatomical_constraints": {
-                "max_leg_amputations": 2,
-                "max_arm_amputations": 2,
-                "max_heart_surgeries": 1,
-                "max_brain_surgeries": 1
-            },
-            "temporal_patterns": {
-                "max_major_surgeries_per_month": 1,
-                "min_days_between_major_surgeries": 30
-            },
-            "geographic_patterns": {
-                "max_hospitals_per_patient": 2,
-                "max_distance_between_hospitals": 100
-            }
-        }
-        
+
+        # Copy the static skeleton and stamp fresh ids; the aggregates are
+        # precomputed constants
+        ids = _batch_ids(len(_LEG_AMP_PROCEDURES) + 1)
+        procedures = [{"id": proc_id, **tpl} for proc_id, tpl in zip(ids, _LEG_AMP_PROCEDURES)]
+
         fraud_case = {
-            "id": str(uuid.uuid4()),
+            "id": ids[-1],
             "patient_id": patient_id,
             "fraud_type": "multiple_impossible_procedures",
             "fraud_confidence": 0.98,
-            "total_amount": sum(p["amount"] for p in procedures),
-            "procedure_count": len(procedures),
-            "hospital_count": len(set(p["hospital"] for p in procedures)),
-            "insurance_provider_count": len(set(p["insurance_provider"] for p in procedures)),
+            "total_amount": _LEG_AMP_TOTAL,
+            "procedure_count": len(_LEG_AMP_PROCEDURES),
+            "hospital_count": _LEG_AMP_HOSPITAL_COUNT,
+            "insurance_provider_count": _LEG_AMP_INSURER_COUNT,
             "procedures": procedures,
-            "anomalies": anomalies,
-            "detection_rules": detection_rules,
-            "created_at": datetime.now().isoformat(),
+            "anomalies": [anomaly.copy() for anomaly in _LEG_AMP_ANOMALIES],
+            "detection_rules": _LEG_DETECTION_RULES,
+            "created_at": now_iso,
             "status": "confirmed_fraud",
             "outcome": {
                 "action_taken": "Patient blacklisted across all insurance providers",
@@ -170,54 +211,60 @@ class FraudDataGenerator:
         
         return fraud_case
 
-    def generate_additional_fraud_cases(self, count=5):
+    def generate_additional_fraud_cases(self, count=5, now=None, now_iso=None):
         """Generate additional realistic fraud cases"""
-        cases = []
-        
-        for i in range(count):
-            case_type = random.choice([
-                "multiple_heart_surgeries",
-                "impossible_arm_amputations", 
-                "fake_kidney_transplants",
-                "billing_inflation",
-                "ghost_procedures"
-            ])
-            
-            if case_type == "multiple_heart_surgeries":
-                case = self._generate_heart_surgery_fraud()
-            elif case_type == "impossible_arm_amputations":
-                case = self._generate_arm_amputation_fraud()
-            elif case_type == "fake_kidney_transplants":
-                case = self._generate_kidney_fraud()
-            elif case_type == "billing_inflation":
-                case = self._generate_billing_inflation_fraud()
-            else:
-                case = self._generate_ghost_procedure_fraud()
-                
-            cases.append(case)
-            
-        return cases
-
-    def _generate_heart_surgery_fraud(self):
+        # Read the clock once for the whole batch instead of per case
+        if now is None:
+            now = datetime.now()
+        if now_iso is None:
+            now_iso = now.isoformat()
+        # Pre-sample all case types in one draw and dispatch by index
+        # instead of a string compare chain per case
+        generators = (
+            self._generate_heart_surgery_fraud,
+            self._generate_arm_amputation_fraud,
+            self._generate_kidney_fraud,
+            self._generate_billing_inflation_fraud,
+            self._generate_ghost_procedure_fraud
+        )
+        type_idx = _rng.integers(0, len(generators), count)
+
+        return [generators[i](now, now_iso) for i in type_idx]
+
+    def _generate_heart_surgery_fraud(self, now=None, now_iso=None):
         """Generate multiple heart surgery fraud case"""
-        patient_id = f"#{random.randint(100000, 999999)}"
-        
-        procedures = []
-        for i in range(3):  # 3 heart surgeries - impossible
-            procedures.append({
-                "id": str(uuid.uuid4()),
-                "hospital": random.choice(self.hospitals),
-                "hospital_id": f"HOSP_{random.randint(1000, 9999)}",
+        if now is None:
+            now = datetime.now()
+        if now_iso is None:
+            now_iso = now.isoformat()
+        patient_id = f"#{_rng.integers(100000, 1000000)}"
+
+        n = 3  # 3 heart surgeries - impossible
+        ids = _batch_ids(n + 1)
+        day_offsets = _rng.integers(10, 91, n)
+        hosp_ids = _rng.integers(1000, 10000, n)
+        hosp_idx = _rng.integers(0, len(self.hospitals), n)
+        amounts = _rng.integers(45000, 55001, n)
+        ins_idx = _rng.integers(0, len(self.insurance_providers), n)
+        names = _rng.integers(1, 1001, n)
+
+        procedures = [
+            {
+                "id": ids[i],
+                "hospital": self.hospitals[hosp_idx[i]],
+                "hospital_id": f"HOSP_{hosp_ids[i]}",
                 "procedure_code": "SUR001",
                 "procedure": "Heart bypass surgery",
-                "date": (datetime.now() - timedelta(days=random.randint(10, 90))).strftime("%Y-%m-%d"),
-                "amount": random.randint(45000, 55000),
-                "insurance_provider": random.choice(self.insurance_providers),
-                "patient_name": f"Patient {random.randint(1, 1000)}"
-            })
+                "date": (now - timedelta(days=int(day_offsets[i]))).strftime("%Y-%m-%d"),
+                "amount": int(amounts[i]),
+                "insurance_provider": self.insurance_providers[ins_idx[i]],
+                "patient_name": f"Patient {names[i]}"
+            }
+            for i in range(n)
+        ]
         
         return {
-            "id": str(uuid.uuid4()),
+            "id": ids[n],
             "patient_id": patient_id,
             "fraud_type": "multiple_impossible_heart_surgeries",
             "fraud_confidence": 0.95,
@@ -232,31 +279,44 @@ class FraudDataGenerator:
                     "severity": "CRITICAL"
                 }
             ],
-            "created_at": datetime.now().isoformat(),
+            "created_at": now_iso,
             "status": "under_investigation"
         }
 
-    def _generate_arm_amputation_fraud(self):
+    def _generate_arm_amputation_fraud(self, now=None, now_iso=None):
         """Generate impossible arm amputation fraud case"""
-        patient_id = f"#{random.randint(100000, 999999)}"
-        
-        procedures = []
-        for i in range(4):  # 4 arm amputations - impossible
-            arm_type = "Left arm" if i % 2 == 0 else "Right arm"
-            procedures.append({
-                "id": str(uuid.uuid4()),
-                "hospital": random.choice(self.hospitals),
-                "hospital_id": f"HOSP_{random.randint(1000, 9999)}",
-                "procedure_code": f"AMP00{3 if 'Left' in arm_type else 4}",
-                "procedure": f"{arm_type} amputation",
-                "date": (datetime.now() - timedelta(days=random.randint(5, 60))).strftime("%Y-%m-%d"),
-                "amount": random.randint(9500, 11000),
-                "insurance_provider": random.choice(self.insurance_providers),
-                "patient_name": f"Patient {random.randint(1, 1000)}"
-            })
+        if now is None:
+            now = datetime.now()
+        if now_iso is None:
+            now_iso = now.isoformat()
+        patient_id = f"#{_rng.integers(100000, 1000000)}"
+
+        n = 4  # 4 arm amputations - impossible
+        ids = _batch_ids(n + 1)
+        day_offsets = _rng.integers(5, 61, n)
+        hosp_ids = _rng.integers(1000, 10000, n)
+        hosp_idx = _rng.integers(0, len(self.hospitals), n)
+        amounts = _rng.integers(9500, 11001, n)
+        ins_idx = _rng.integers(0, len(self.insurance_providers), n)
+        names = _rng.integers(1, 1001, n)
+
+        procedures = [
+            {
+                "id": ids[i],
+                "hospital": self.hospitals[hosp_idx[i]],
+                "hospital_id": f"HOSP_{hosp_ids[i]}",
+                "procedure_code": f"AMP00{3 if i % 2 == 0 else 4}",
+                "procedure": f"{'Left arm' if i % 2 == 0 else 'Right arm'} amputation",
+                "date": (now - timedelta(days=int(day_offsets[i]))).strftime("%Y-%m-%d"),
+                "amount": int(amounts[i]),
+                "insurance_provider": self.insurance_providers[ins_idx[i]],
+                "patient_name": f"Patient {names[i]}"
+            }
+            for i in range(n)
+        ]
         
         return {
-            "id": str(uuid.uuid4()),
+            "id": ids[n],
             "patient_id": patient_id,
             "fraud_type": "multiple_impossible_arm_amputations",
             "fraud_confidence": 0.97,
@@ -271,28 +331,38 @@ class FraudDataGenerator:
                     "severity": "CRITICAL"
                 }
             ],
-            "created_at": datetime.now().isoformat(),
+            "created_at": now_iso,
             "status": "confirmed_fraud"
         }
 
-    def _generate_kidney_fraud(self):
+    def _generate_kidney_fraud(self, now=None, now_iso=None):
         """Generate fake kidney transplant fraud"""
-        patient_id = f"#{random.randint(100000, 999999)}"
-        
+        if now is None:
+            now = datetime.now()
+        if now_iso is None:
+            now_iso = now.isoformat()
+        # One batched draw covers every numeric field of the case
+        pid, hosp_i, hosp_num, days, ins_i, name = _rng.integers(
+            (100000, 0, 1000, 1, 0, 1),
+            (1000000, len(self.hospitals), 10000, 31, len(self.insurance_providers), 1001)
+        )
+        patient_id = f"#{pid}"
+
+        proc_id, case_id = _batch_ids(2)
         procedures = [{
-            "id": str(uuid.uuid4()),
-            "hospital": random.choice(self.hospitals),
-            "hospital_id": f"HOSP_{random.randint(1000, 9999)}",
+            "id": proc_id,
+            "hospital": self.hospitals[hosp_i],
+            "hospital_id": f"HOSP_{hosp_num}",
             "procedure_code": "SUR003",
             "procedure": "Kidney transplant",
-            "date": (datetime.now() - timedelta(days=random.randint(1, 30))).strftime("%Y-%m-%d"),
+            "date": (now - timedelta(days=int(days))).strftime("%Y-%m-%d"),
             "amount": 120000,
-            "insurance_provider": random.choice(self.insurance_providers),
-            "patient_name": f"Patient {random.randint(1, 1000)}"
+            "insurance_provider": self.insurance_providers[ins_i],
+            "patient_name": f"Patient {name}"
         }]
         
         return {
-            "id": str(uuid.uuid4()),
+            "id": case_id,
             "patient_id": patient_id,
             "fraud_type": "fake_kidney_transplant",
             "fraud_confidence": 0.85,
@@ -312,28 +382,38 @@ class FraudDataGenerator:
                     "severity": "MEDIUM"
                 }
             ],
-            "created_at": datetime.now().isoformat(),
+            "created_at": now_iso,
             "status": "under_investigation"
         }
 
-    def _generate_billing_inflation_fraud(self):
+    def _generate_billing_inflation_fraud(self, now=None, now_iso=None):
         """Generate billing inflation fraud case"""
-        patient_id = f"#{random.randint(100000, 999999)}"
-        
+        if now is None:
+            now = datetime.now()
+        if now_iso is None:
+            now_iso = now.isoformat()
+        # One batched draw covers every numeric field of the case
+        pid, hosp_i, hosp_num, days, ins_i, name = _rng.integers(
+            (100000, 0, 1000, 1, 0, 1),
+            (1000000, len(self.hospitals), 10000, 31, len(self.insurance_providers), 1001)
+        )
+        patient_id = f"#{pid}"
+
+        proc_id, case_id = _batch_ids(2)
         procedures = [{
-            "id": str(uuid.uuid4()),
-            "hospital": random.choice(self.hospitals),
-            "hospital_id": f"HOSP_{random.randint(1000, 9999)}",
+            "id": proc_id,
+            "hospital": self.hospitals[hosp_i],
+            "hospital_id": f"HOSP_{hosp_num}",
             "procedure_code": "COM001",
             "procedure": "Appendectomy",
-            "date": (datetime.now() - timedelta(days=random.randint(1, 30))).strftime("%Y-%m-%d"),
+            "date": (now - timedelta(days=int(days))).strftime("%Y-%m-%d"),
             "amount": 25000,  # Inflated from normal 5000
-            "insurance_provider": random.choice(self.insurance_providers),
-            "patient_name": f"Patient {random.randint(1, 1000)}"
+            "insurance_provider": self.insurance_providers[ins_i],
+            "patient_name": f"Patient {name}"
         }]
         
         return {
-            "id": str(uuid.uuid4()),
+            "id": case_id,
             "patient_id": patient_id,
             "fraud_type": "billing_inflation",
             "fraud_confidence": 0.78,
@@ -348,28 +428,38 @@ class FraudDataGenerator:
                     "severity": "HIGH"
                 }
             ],
-            "created_at": datetime.now().isoformat(),
+            "created_at": now_iso,
             "status": "flagged"
         }
 
-    def _generate_ghost_procedure_fraud(self):
+    def _generate_ghost_procedure_fraud(self, now=None, now_iso=None):
         """Generate ghost procedure fraud case"""
-        patient_id = f"#{random.randint(100000, 999999)}"
-        
+        if now is None:
+            now = datetime.now()
+        if now_iso is None:
+            now_iso = now.isoformat()
+        # One batched draw covers every numeric field of the case
+        pid, hosp_i, hosp_num, days, ins_i, name = _rng.integers(
+            (100000, 0, 1000, 1, 0, 1),
+            (1000000, len(self.hospitals), 10000, 31, len(self.insurance_providers), 1001)
+        )
+        patient_id = f"#{pid}"
+
+        proc_id, case_id = _batch_ids(2)
         procedures = [{
-            "id": str(uuid.uuid4()),
-            "hospital": random.choice(self.hospitals),
-            "hospital_id": f"HOSP_{random.randint(1000, 9999)}",
+            "id": proc_id,
+            "hospital": self.hospitals[hosp_i],
+            "hospital_id": f"HOSP_{hosp_num}",
             "procedure_code": "COM002",
             "procedure": "Gallbladder removal",
-            "date": (datetime.now() - timedelta(days=random.randint(1, 30))).strftime("%Y-%m-%d"),
+            "date": (now - timedelta(days=int(days))).strftime("%Y-%m-%d"),
             "amount": 8000,
-            "insurance_provider": random.choice(self.insurance_providers),
-            "patient_name": f"Patient {random.randint(1, 1000)}"
+            "insurance_provider": self.insurance_providers[ins_i],
+            "patient_name": f"Patient {name}"
         }]
         
         return {
-            "id": str(uuid.uuid4()),
+            "id": case_id,
             "patient_id": patient_id,
             "fraud_type": "ghost_procedure",
             "fraud_confidence": 0.82,
@@ -384,15 +474,19 @@ class FraudDataGenerator:
                     "severity": "HIGH"
                 }
             ],
-            "created_at": datetime.now().isoformat(),
+            "created_at": now_iso,
             "status": "under_investigation"
         }
 
-    def generate_complete_dataset(self):
+    def generate_complete_dataset(self, now=None):
         """Generate complete fraud dataset including the leg amputation case"""
+        if now is None:
+            now = datetime.now()
+        now_iso = now.isoformat()
+
         dataset = {
             "metadata": {
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": now_iso,
                 "total_cases": 6,
                 "fraud_types": [
                     "multiple_impossible_procedures",
@@ -407,23 +501,66 @@ class FraudDataGenerator:
         }
         
         # Add the main leg amputation fraud case
-        leg_amputation_case = self.generate_leg_amputation_fraud_case()
+        leg_amputation_case = self.generate_leg_amputation_fraud_case(now_iso)
         dataset["cases"].append(leg_amputation_case)
         
         # Add additional fraud cases
-        additional_cases = self.generate_additional_fraud_cases(5)
+        additional_cases = self.generate_additional_fraud_cases(5, now, now_iso)
         dataset["cases"].extend(additional_cases)
         
         return dataset
 
+def dump_parquet(dataset, path="fraud_cases.parquet"):
+    """
+    Flatten cases[*].procedures[*] into a columnar table and write Parquet
+
+    Analytics consumers that scan a few numeric columns (amount,
+    procedure_code, patient_id) only read those column chunks instead of
+    parsing the whole nested JSON per query. Rows are sorted by patient_id
+    so readers can prune row groups via the min/max page statistics, and
+    the low-cardinality string columns are dictionary-encoded.
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required for Parquet output")
+
+    rows = [
+        {
+            "case_id": case["id"],
+            "patient_id": case["patient_id"],
+            "fraud_type": case["fraud_type"],
+            "fraud_confidence": case["fraud_confidence"],
+            **procedure
+        }
+        for case in dataset["cases"]
+        for procedure in case["procedures"]
+    ]
+    rows.sort(key=lambda r: r["patient_id"])
+
+    table = pa.Table.from_pylist(rows)
+    pq.write_table(
+        table, path,
+        compression="zstd",
+        use_dictionary=["hospital", "insurance_provider", "procedure_code"]
+    )
+    return path
+
 if __name__ == "__main__":
     generator = FraudDataGenerator()
     dataset = generator.generate_complete_dataset()
     
-    # Save to JSON file
-    with open("fraud_cases_dataset.json", "w") as f:
-        json.dump(dataset, f, indent=2)
-    
+    # Save to JSON file; orjson serializes the nested dicts in C rather
+    # than formatting them in the interpreter
+    if orjson is not None:
+        with open("fraud_cases_dataset.json", "wb") as f:
+            f.write(orjson.dumps(dataset, option=orjson.OPT_INDENT_2))
+    else:
+        with open("fraud_cases_dataset.json", "w") as f:
+            json.dump(dataset, f, indent=2)
+
+    # Columnar copy for scan-heavy analytics consumers
+    if pa is not None:
+        dump_parquet(dataset)
+
     print(f"Generated {len(dataset['cases'])} fraud cases")
     print(f"Total fraudulent amount: ${sum(case['total_amount'] for case in dataset['cases']):,}")
     